@@ -1,4 +1,7 @@
+import logging
+import queue
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -12,12 +15,32 @@ from .routers.storage import router as storage_router
 from .services.robot_service import robot_service
 from .services.voice_tracking_service import voice_tracking_service
 from .services.voice_control_service import voice_control_service
+from .services.tts_service import tts_service
+from .services.token_service import token_service
 
 settings = get_settings()
 
 
+def _setup_logging() -> QueueListener:
+    """Send app logs through a queue so emitting a record never blocks the event loop."""
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s:     %(name)s - %(message)s"))
+
+    app_logger = logging.getLogger(__package__)
+    app_logger.addHandler(QueueHandler(log_queue))
+    app_logger.setLevel(logging.INFO)
+    app_logger.propagate = False
+
+    return QueueListener(log_queue, handler)
+
+
+log_listener = _setup_logging()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    log_listener.start()
     # Initialize database (optional - app works without it)
     await init_db()
     print("Backend starting...")
@@ -27,9 +50,12 @@ async def lifespan(app: FastAPI):
         await voice_control_service.stop()
     if voice_tracking_service.is_tracking():
         await voice_tracking_service.stop_tracking()
+    await tts_service.close()
+    await token_service.close()
     if robot_service.connected:
         await robot_service.disconnect()
     print("Backend shutting down...")
+    log_listener.stop()
 
 
 app = FastAPI(
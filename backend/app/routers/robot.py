@@ -367,8 +367,9 @@ async def look_at_speaker(request: LookAtSpeakerRequest):
     """
     Manually turn head towards a specific direction.
     DoA (Direction of Arrival): -180 to 180 degrees, 0 = front.
+    Waits for the head move so the response reflects whether it happened.
     """
-    result = await voice_tracking_service.look_at_speaker(request.doa, request.smooth)
+    result = await voice_tracking_service.look_at_speaker(request.doa, request.smooth, wait=True)
     return ActionResponse(**result)
 
 
@@ -404,21 +405,18 @@ async def video_stream_websocket(websocket: WebSocket):
     """WebSocket endpoint for video streaming at high FPS."""
     await websocket.accept()
 
-    # Queue to receive frames
-    frame_queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+    # Queue to receive frames; one slot so at most one frame waits behind the send
+    frame_queue: asyncio.Queue = asyncio.Queue(maxsize=1)
 
-    async def on_frame(frame_data: dict):
+    def on_frame(frame_data: dict):
         """Callback when a frame is captured."""
-        try:
-            # Drop old frames if queue is full (keep latest)
-            if frame_queue.full():
-                try:
-                    frame_queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    pass
-            frame_queue.put_nowait(frame_data)
-        except Exception:
-            pass
+        # Drop old frames if queue is full (keep latest)
+        if frame_queue.full():
+            try:
+                frame_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        frame_queue.put_nowait(frame_data)
 
     # Subscribe to frames
     video_stream_service.subscribe(on_frame)
@@ -433,8 +431,11 @@ async def video_stream_websocket(websocket: WebSocket):
                 # Wait for frame with timeout
                 frame_data = await asyncio.wait_for(frame_queue.get(), timeout=1.0)
 
-                # Send frame to client
-                await websocket.send_json(frame_data)
+                # Send frames as binary (header + JPEG); status messages stay JSON
+                if "jpeg_bytes" in frame_data:
+                    await websocket.send_bytes(video_stream_service.pack_frame(frame_data))
+                else:
+                    await websocket.send_json(frame_data)
 
             except asyncio.TimeoutError:
                 # Send keepalive
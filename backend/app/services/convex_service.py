@@ -174,6 +174,46 @@ class ConvexService:
             print(f"[Convex] Save token mint error: {e}")
             return {"success": False, "message": str(e)}
 
+    async def save_token_mints_batch(self, mints: List[dict]) -> dict:
+        """
+        Save several token mint records to Convex from one executor job.
+
+        The deployment only exposes tokens:saveMint, so each record is still its
+        own mutation; batching saves the per-mint thread hop. A failing record is
+        logged and skipped so it doesn't take the rest of the batch with it.
+        """
+        if not self.enabled:
+            return {"success": False, "message": "Convex not configured"}
+
+        try:
+            client = self._get_client()
+            loop = asyncio.get_event_loop()
+
+            now = datetime.now().isoformat()
+            for mint_data in mints:
+                mint_data.setdefault("timestamp", now)
+
+            def _save():
+                saved, failed = [], 0
+                for mint_data in mints:
+                    try:
+                        saved.append(client.mutation("tokens:saveMint", mint_data))
+                    except Exception as e:
+                        failed += 1
+                        print(f"[Convex] Save token mint error: {e}")
+                return saved, failed
+
+            saved, failed = await loop.run_in_executor(None, _save)
+
+            if failed:
+                return {"success": False, "count": len(saved), "failed": failed,
+                        "message": f"{failed} of {len(mints)} mints failed to save"}
+            return {"success": True, "count": len(saved)}
+
+        except Exception as e:
+            print(f"[Convex] Save token mint batch error: {e}")
+            return {"success": False, "message": str(e)}
+
     async def get_user_tokens(self, user_id: str) -> dict:
         """Get token balance for a user."""
         if not self.enabled:
@@ -54,6 +54,7 @@ class RobotService:
         self._audio_playing = False
         self._audio_recording = False
         self._camera_started = False
+        self.doa_unit = "rad"  # Unit of direction_of_arrival from get_voice_direction
 
     async def connect(self, connection_mode: str = "auto", host: str = None) -> dict:
         """Initialize connection to Reachy Mini robot."""
@@ -548,8 +549,7 @@ class RobotService:
 
     async def capture_image(self) -> dict:
         """Capture an image from the robot's camera and return as base64."""
-        import base64
-        import io
+        import binascii
 
         # First try WebRTC camera if available
         if self.mini and hasattr(self.mini, 'media') and self.mini.media:
@@ -569,15 +569,13 @@ class RobotService:
                 await self._log("DEBUG", "camera", f"Frame result: {type(frame)}, is None: {frame is None}")
 
                 if frame is not None:
-                    from PIL import Image
-                    if len(frame.shape) == 3 and frame.shape[2] == 3:
-                        import cv2
-                        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    img = Image.fromarray(frame)
-                    buffer = io.BytesIO()
-                    img.save(buffer, format='JPEG', quality=85)
-                    img_bytes = buffer.getvalue()
-                    img_b64 = base64.b64encode(img_bytes).decode('utf-8')
+                    import cv2
+                    # OpenCV encodes the camera's BGR frame directly, no RGB shuffle needed
+                    ok, buffer = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), 85])
+                    if not ok:
+                        raise ValueError("JPEG encoding failed")
+                    img_bytes = buffer.tobytes()
+                    img_b64 = binascii.b2a_base64(img_bytes, newline=False).decode('ascii')
                     await self._log("INFO", "camera", "Captured image from WebRTC camera")
                     return {
                         "success": True,
@@ -597,7 +595,7 @@ class RobotService:
 
     async def _capture_image_via_ssh(self) -> dict:
         """Capture an image from robot camera via SSH."""
-        import base64
+        import binascii
         import subprocess
         import tempfile
 
@@ -644,7 +642,7 @@ class RobotService:
             if len(img_bytes) < 1000:
                 return {"success": False, "message": "Image capture returned empty data"}
 
-            img_b64 = base64.b64encode(img_bytes).decode('utf-8')
+            img_b64 = binascii.b2a_base64(img_bytes, newline=False).decode('ascii')
             await self._log("INFO", "camera", f"Captured image via SSH ({len(img_bytes)} bytes)")
 
             return {
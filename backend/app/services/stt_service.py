@@ -3,7 +3,7 @@ Speech-to-Text Service using Deepgram streaming API v5.
 Handles real-time audio transcription from the robot's microphone.
 """
 import asyncio
-from typing import Callable, Optional, List
+from typing import Callable, Optional, List, Union
 from ..config import get_settings
 
 settings = get_settings()
@@ -176,11 +176,12 @@ class STTService:
             print(f"[STT] Stop error: {e}")
             return {"success": False, "message": f"STT stop failed: {str(e)}"}
 
-    async def send_audio(self, audio_data: bytes) -> bool:
+    async def send_audio(self, audio_data: Union[bytes, bytearray, memoryview]) -> bool:
         """Send audio data to Deepgram for transcription.
 
         Args:
-            audio_data: Raw PCM audio bytes (16-bit, 16kHz, mono)
+            audio_data: Raw PCM audio (16-bit, 16kHz, mono) as bytes or any
+                byte buffer; it is sent synchronously, so the caller may reuse it
 
         Returns:
             True if audio was sent successfully
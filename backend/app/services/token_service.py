@@ -4,12 +4,19 @@ Supports both internal points system and blockchain token integration.
 """
 
 import asyncio
+import heapq
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, fields
+from itertools import islice
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Set, Union
 from pathlib import Path
-import json
 import uuid
 
+import msgpack
+import orjson
+
 from ..config import get_settings
 
 settings = get_settings()
@@ -18,6 +25,53 @@ settings = get_settings()
 TOKENS_DIR = Path(__file__).parent.parent.parent / "data" / "tokens"
 TOKENS_DIR.mkdir(parents=True, exist_ok=True)
 
+BALANCES_FILE = TOKENS_DIR / "balances.json"
+# Append-only log, one MessagePack record per transaction
+TRANSACTIONS_FILE = TOKENS_DIR / "transactions.msgpack"
+LEGACY_TRANSACTIONS_FILE = TOKENS_DIR / "transactions.json"
+
+# Number of recent transactions kept in memory
+MAX_CACHED_TRANSACTIONS = 1000
+
+# Number of recent transactions kept per user for history lookups
+MAX_USER_TRANSACTIONS = 200
+
+# Convex mint batching: flush every interval or once a batch fills up
+CONVEX_FLUSH_INTERVAL = 0.1  # seconds
+CONVEX_BATCH_SIZE = 32
+CONVEX_MAX_PENDING = 1000  # mint_tokens waits for a flush beyond this
+
+
+def _format_timestamp(timestamp) -> str:
+    """Format a stored timestamp (epoch ns, or ISO string in older records) as ISO 8601."""
+    if isinstance(timestamp, str):
+        return timestamp
+    return datetime.fromtimestamp(timestamp / 1e9).isoformat()
+
+
+@dataclass(slots=True, kw_only=True)
+class Transaction:
+    """A mint or transfer record."""
+    id: str
+    user_id: Optional[str] = None      # Mints
+    from_user: Optional[str] = None    # Transfers
+    to_user: Optional[str] = None      # Transfers
+    type: str
+    token_type: Optional[str] = None   # Mints
+    amount: int
+    reason: str
+    timestamp: Union[int, str]         # Epoch ns (ISO string in older records)
+
+    def to_dict(self) -> dict:
+        """Serialize, leaving out fields that don't apply to this kind of transaction."""
+        return {
+            name: value for name in _TRANSACTION_FIELDS
+            if (value := getattr(self, name)) is not None
+        }
+
+
+_TRANSACTION_FIELDS = tuple(f.name for f in fields(Transaction))
+
 
 class TokenType:
     INTERACTION = "interaction"      # Earned through interactions
@@ -43,7 +97,16 @@ class TokenService:
     def __init__(self):
         self._convex_service = None
         self._balances: Dict[str, int] = {}
-        self._transactions: List[dict] = []
+        self._transactions: List[Transaction] = []
+        self._unsaved_transactions: List[Transaction] = []
+        self._tx_by_user: Dict[str, deque] = defaultdict(
+            lambda: deque(maxlen=MAX_USER_TRANSACTIONS)
+        )
+        self._checkin_days: Dict[str, Set[str]] = {}
+        self._save_lock = asyncio.Lock()
+        self._pending_convex: List[dict] = []
+        self._convex_batch_full = asyncio.Event()
+        self._convex_flush_task: Optional[asyncio.Task] = None
         self._load_data()
 
     def _get_convex_service(self):
@@ -55,32 +118,135 @@ class TokenService:
 
     def _load_data(self):
         """Load token data from local storage."""
-        balances_file = TOKENS_DIR / "balances.json"
-        transactions_file = TOKENS_DIR / "transactions.json"
-
-        if balances_file.exists():
+        if BALANCES_FILE.exists():
             try:
-                with open(balances_file, 'r') as f:
-                    self._balances = json.load(f)
+                with open(BALANCES_FILE, 'rb') as f:
+                    self._balances = orjson.loads(f.read())
             except Exception:
                 self._balances = {}
 
-        if transactions_file.exists():
+        if TRANSACTIONS_FILE.exists():
+            try:
+                with open(TRANSACTIONS_FILE, 'rb') as f:
+                    unpacker = msgpack.Unpacker(f, raw=False)
+                    records = deque(unpacker, maxlen=MAX_CACHED_TRANSACTIONS)
+                self._transactions = [Transaction(**record) for record in records]
+            except Exception:
+                self._transactions = []
+        elif LEGACY_TRANSACTIONS_FILE.exists():
             try:
-                with open(transactions_file, 'r') as f:
-                    self._transactions = json.load(f)
+                with open(LEGACY_TRANSACTIONS_FILE, 'rb') as f:
+                    records = orjson.loads(f.read())
+                self._transactions = [Transaction(**record) for record in records]
+                # Migrate the old JSON snapshot into the append-only log
+                self._append_transactions(self._transactions)
             except Exception:
                 self._transactions = []
 
-    def _save_data(self):
-        """Save token data to local storage."""
+        for transaction in self._transactions:
+            self._index_transaction(transaction)
+
+    def _append_transactions(self, transactions: List[Transaction]):
+        """Append transaction records to the MessagePack log."""
+        # Pack first and write once, so a failure while packing leaves the log untouched
+        data = b"".join(
+            msgpack.packb(transaction.to_dict(), use_bin_type=True) for transaction in transactions
+        )
+        with open(TRANSACTIONS_FILE, 'ab') as f:
+            f.write(data)
+
+    def _save_data_sync(self, balances: Dict[str, int], new_transactions: List[Transaction]) -> bool:
+        """
+        Save token data to local storage (blocking, runs in a worker thread).
+
+        Returns False if the new transactions could not be appended to the log.
+        """
         try:
-            with open(TOKENS_DIR / "balances.json", 'w') as f:
-                json.dump(self._balances, f, indent=2)
-            with open(TOKENS_DIR / "transactions.json", 'w') as f:
-                json.dump(self._transactions[-1000:], f, indent=2)  # Keep last 1000
+            with open(BALANCES_FILE, 'wb') as f:
+                f.write(orjson.dumps(balances, option=orjson.OPT_INDENT_2))
         except Exception as e:
-            print(f"[Token] Failed to save data: {e}")
+            print(f"[Token] Failed to save balances: {e}")
+
+        if not new_transactions:
+            return True
+        try:
+            self._append_transactions(new_transactions)
+            return True
+        except Exception as e:
+            print(f"[Token] Failed to save transactions: {e}")
+            return False
+
+    async def _save_data(self):
+        """Save token data without blocking the event loop."""
+        # Snapshot on the loop thread so the worker never sees a dict mid-update
+        balances = dict(self._balances)
+        new_transactions, self._unsaved_transactions = self._unsaved_transactions, []
+        async with self._save_lock:
+            saved = await asyncio.to_thread(self._save_data_sync, balances, new_transactions)
+        if not saved:
+            # Put them back ahead of anything recorded meanwhile; the next save retries them
+            self._unsaved_transactions[:0] = new_transactions
+
+    def _index_transaction(self, transaction: Transaction):
+        """Add a transaction to the per-user history of every party involved."""
+        parties = {
+            transaction.user_id,
+            transaction.from_user,
+            transaction.to_user
+        }
+        parties.discard(None)
+        for user_id in parties:
+            self._tx_by_user[user_id].append(transaction)
+
+        if transaction.token_type == TokenType.DAILY_CHECKIN:
+            day = _format_timestamp(transaction.timestamp)[:10]
+            self._checkin_days.setdefault(transaction.user_id, set()).add(day)
+
+    def _record_transaction(self, transaction: Transaction):
+        """Add a transaction to the in-memory cache and the pending write batch."""
+        self._transactions.append(transaction)
+        if len(self._transactions) > MAX_CACHED_TRANSACTIONS:
+            del self._transactions[:-MAX_CACHED_TRANSACTIONS]
+        self._unsaved_transactions.append(transaction)
+        self._index_transaction(transaction)
+
+    async def _queue_convex_mint(self, mint_data: dict):
+        """Add a mint to the pending Convex batch and make sure a flusher is running."""
+        self._pending_convex.append(mint_data)
+
+        if len(self._pending_convex) >= CONVEX_MAX_PENDING:
+            # Backpressure: don't let the queue grow without bound if Convex is slow
+            await self._flush_convex()
+            return
+
+        if len(self._pending_convex) >= CONVEX_BATCH_SIZE:
+            self._convex_batch_full.set()
+
+        if self._convex_flush_task is None or self._convex_flush_task.done():
+            self._convex_flush_task = asyncio.create_task(self._convex_flusher())
+
+    async def _convex_flusher(self):
+        """Flush pending Convex mints until the queue is empty."""
+        while self._pending_convex:
+            try:
+                await asyncio.wait_for(self._convex_batch_full.wait(), timeout=CONVEX_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._convex_batch_full.clear()
+            await self._flush_convex()
+
+    async def _flush_convex(self):
+        """Send the pending Convex mints as one batch."""
+        while self._pending_convex:
+            batch = self._pending_convex[:CONVEX_BATCH_SIZE]
+            del self._pending_convex[:CONVEX_BATCH_SIZE]
+            await self._get_convex_service().save_token_mints_batch(batch)
+
+    async def close(self):
+        """Flush pending Convex mints on shutdown."""
+        if self._convex_flush_task is not None and not self._convex_flush_task.done():
+            await self._convex_flush_task
+        await self._flush_convex()
 
     async def mint_tokens(self, user_id: str, token_type: str,
                          amount: Optional[int] = None, reason: str = "") -> dict:
@@ -89,15 +255,15 @@ class TokenService:
             amount = REWARD_AMOUNTS.get(token_type, 1)
 
         # Create transaction record
-        transaction = {
-            "id": str(uuid.uuid4()),
-            "user_id": user_id,
-            "type": "mint",
-            "token_type": token_type,
-            "amount": amount,
-            "reason": reason,
-            "timestamp": datetime.now().isoformat()
-        }
+        transaction = Transaction(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            type="mint",
+            token_type=token_type,
+            amount=amount,
+            reason=reason,
+            timestamp=time.time_ns()
+        )
 
         # Update local balance
         if user_id not in self._balances:
@@ -105,23 +271,25 @@ class TokenService:
         self._balances[user_id] += amount
 
         # Record transaction
-        self._transactions.append(transaction)
-        self._save_data()
+        self._record_transaction(transaction)
 
-        # Try to save to Convex
+        # Queue for Convex (if available); the flusher sends mints in batches
         convex = self._get_convex_service()
         if convex.is_configured():
-            await convex.save_token_mint({
+            await self._queue_convex_mint({
                 "userId": user_id,
                 "tokenType": token_type,
                 "amount": amount,
                 "reason": reason,
-                "transactionId": transaction["id"]
+                "transactionId": transaction.id,
+                "timestamp": _format_timestamp(transaction.timestamp)
             })
 
+        await self._save_data()
+
         return {
             "success": True,
-            "transaction_id": transaction["id"],
+            "transaction_id": transaction.id,
             "amount": amount,
             "new_balance": self._balances[user_id],
             "message": f"Minted {amount} tokens for {token_type}"
@@ -139,15 +307,15 @@ class TokenService:
             }
 
         # Create transaction
-        transaction = {
-            "id": str(uuid.uuid4()),
-            "type": "transfer",
-            "from_user": from_user,
-            "to_user": to_user,
-            "amount": amount,
-            "reason": reason,
-            "timestamp": datetime.now().isoformat()
-        }
+        transaction = Transaction(
+            id=str(uuid.uuid4()),
+            type="transfer",
+            from_user=from_user,
+            to_user=to_user,
+            amount=amount,
+            reason=reason,
+            timestamp=time.time_ns()
+        )
 
         # Update balances
         self._balances[from_user] -= amount
@@ -155,12 +323,12 @@ class TokenService:
             self._balances[to_user] = 0
         self._balances[to_user] += amount
 
-        self._transactions.append(transaction)
-        self._save_data()
+        self._record_transaction(transaction)
+        await self._save_data()
 
         return {
             "success": True,
-            "transaction_id": transaction["id"],
+            "transaction_id": transaction.id,
             "amount": amount,
             "from_balance": self._balances[from_user],
             "to_balance": self._balances[to_user]
@@ -177,28 +345,27 @@ class TokenService:
 
     async def get_transactions(self, user_id: str, limit: int = 50) -> dict:
         """Get transaction history for a user."""
-        user_transactions = [
-            t for t in self._transactions
-            if t.get("user_id") == user_id or
-               t.get("from_user") == user_id or
-               t.get("to_user") == user_id
-        ]
+        user_transactions = self._tx_by_user.get(user_id, ())
 
-        # Sort by timestamp descending
-        user_transactions.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+        # Index is in insertion order, so the newest entries are at the end
+        recent = list(islice(reversed(user_transactions), max(limit, 0)))
+        recent = [
+            {**t.to_dict(), "timestamp": _format_timestamp(t.timestamp)}
+            for t in recent
+        ]
 
         return {
             "success": True,
-            "transactions": user_transactions[:limit]
+            "transactions": recent
         }
 
     async def get_leaderboard(self, limit: int = 10) -> dict:
         """Get top token holders."""
-        sorted_balances = sorted(
+        sorted_balances = heapq.nlargest(
+            limit,
             self._balances.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:limit]
+            key=lambda x: x[1]
+        )
 
         leaderboard = [
             {"rank": i + 1, "user_id": user_id, "balance": balance}
@@ -238,14 +405,8 @@ class TokenService:
         """Reward tokens for daily check-in."""
         # Check if already checked in today
         today = datetime.now().date().isoformat()
-        recent_checkins = [
-            t for t in self._transactions
-            if t.get("user_id") == user_id and
-               t.get("token_type") == TokenType.DAILY_CHECKIN and
-               t.get("timestamp", "").startswith(today)
-        ]
 
-        if recent_checkins:
+        if today in self._checkin_days.get(user_id, ()):
             return {
                 "success": False,
                 "message": "Already checked in today",
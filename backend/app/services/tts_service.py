@@ -1,16 +1,127 @@
 import asyncio
+import hashlib
+import io
 import os
+import shutil
 import tempfile
 import re
-from typing import Optional
+import socket
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Set
 from elevenlabs import ElevenLabs
 from ..config import get_settings
 
+try:
+    import paramiko
+except ImportError:
+    paramiko = None
+
+# Errors that mean the SSH connection itself is broken and should be reopened
+SSH_ERRORS = (socket.error, EOFError) + ((paramiko.SSHException,) if paramiko else ())
+
 settings = get_settings()
 
 ROBOT_USER = "pollen"
 ROBOT_PASSWORD = "root"
 
+# On-disk cache of generated speech, keyed by voice/model/text hash
+TTS_CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "tts_cache"
+TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+# Clips kept on disk; least recently used ones are evicted beyond this
+TTS_DISK_CACHE_MAX_FILES = 500
+
+# Number of generated clips kept in memory
+TTS_MEMORY_CACHE_SIZE = 128
+
+# Local players that accept MP3 on stdin, in order of preference
+LOCAL_STDIN_PLAYERS = [
+    ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-"],
+    ["mpv", "--no-video", "--really-quiet", "-"],
+]
+
+# Patterns used by clean_text_for_speech, compiled once
+_ACTION_BRACKET_RE = re.compile(r'\s*\[[^\]]+\]\s*')
+_EMPHASIS_RE = re.compile(r'\*[^*]+\*')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Directory on the robot holding staged clips, named by cache key
+ROBOT_TTS_DIR = "/tmp/tts"
+# Staged clips kept on the robot; the least recently played are pruned beyond this
+ROBOT_TTS_MAX_CLIPS = 50
+_GST_PLAYBACK = "decodebin ! audioconvert ! audioresample ! autoaudiosink"
+
+# Remote pipeline that plays MP3 from stdin as it arrives
+ROBOT_PIPE_PLAY_CMD = f"gst-launch-1.0 -q fdsrc fd=0 ! {_GST_PLAYBACK}"
+
+# Same, but also keeps a copy that can be staged for reuse
+ROBOT_STREAM_PLAY_CMD = (
+    f"mkdir -p {ROBOT_TTS_DIR} && "
+    f"tee {ROBOT_TTS_DIR}/{{key}}.part | {ROBOT_PIPE_PLAY_CMD}"
+)
+
+# Stages a streamed copy once the whole clip was sent and played cleanly, then prunes
+# the least recently played clips and any copies left by interrupted streams
+ROBOT_STAGE_CMD = (
+    f"mv {ROBOT_TTS_DIR}/{{key}}.part {ROBOT_TTS_DIR}/{{key}}.mp3 && "
+    f"(cd {ROBOT_TTS_DIR} && ls -t -- *.mp3 | tail -n +{ROBOT_TTS_MAX_CLIPS + 1} | xargs -r rm -f -- ; "
+    f"find . -name '*.part' -mmin +10 -delete; true)"
+)
+
+# How long to wait for a remote player to fail fast before assuming it is playing
+PLAYER_START_WAIT = 0.2
+# How often to check whether a remote player has finished
+PLAYER_POLL_INTERVAL = 0.25
+
+# After a failed SSH connect, skip SSH playback for this long instead of timing out again
+SSH_RETRY_DELAY = 30.0
+
+# Remote command that plays a previously staged clip (fails if it has been removed)
+ROBOT_STAGED_PLAY_CMD = (
+    f"test -f {ROBOT_TTS_DIR}/{{key}}.mp3 && touch {ROBOT_TTS_DIR}/{{key}}.mp3 && "
+    f"gst-launch-1.0 -q filesrc location={ROBOT_TTS_DIR}/{{key}}.mp3 ! {_GST_PLAYBACK}"
+)
+
+
+class _AudioStream:
+    """
+    Iterator over generated audio chunks that keeps what it has yielded.
+
+    Errors raised by the generator itself (e.g. the ElevenLabs API failing
+    mid-stream) are kept in ``error`` so callers can tell them apart from
+    failures of whatever the chunks were being sent to.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self.received: list = []
+        self.complete = False
+        self.error: Optional[Exception] = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        if self.error is not None:
+            raise self.error
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self.complete = True
+            raise
+        except Exception as e:
+            self.error = e
+            raise
+        self.received.append(chunk)
+        return chunk
+
+    def read_all(self) -> bytes:
+        """Generate whatever is left and return the whole clip (blocking)."""
+        for _ in self:
+            pass
+        return b"".join(self.received)
+
 
 class TTSService:
     def __init__(self):
@@ -20,6 +131,14 @@ class TTSService:
         self.model_id = "eleven_multilingual_v2"
         self._robot_service = None
         self._client = None
+        self._ssh = None
+        self._sftp = None
+        self._ssh_lock = asyncio.Lock()
+        self._tts_cache: OrderedDict[str, bytes] = OrderedDict()
+        # Clips staged on the robot, least recently played first (mirrors the remote pruning)
+        self._remote_cache: OrderedDict[str, None] = OrderedDict()
+        self._ssh_failed_at: Optional[float] = None
+        self._player_tasks: Set[asyncio.Task] = set()  # Players and their follow-ups still running
 
     def is_configured(self) -> bool:
         return self.enabled
@@ -41,13 +160,163 @@ class TTSService:
         """Get robot host from settings."""
         return settings.robot_host or "reachy-mini.local"
 
+    async def _get_ssh_client(self):
+        """Get the cached SSH connection to the robot, reconnecting if it dropped."""
+        if paramiko is None:
+            raise RuntimeError("paramiko not installed")
+
+        async with self._ssh_lock:
+            transport = self._ssh.get_transport() if self._ssh else None
+            if transport is None or not transport.is_active():
+                self._close_ssh()
+
+                loop = asyncio.get_running_loop()
+                # Don't sit through another connect timeout right after one failed
+                if self._ssh_failed_at is not None and loop.time() - self._ssh_failed_at < SSH_RETRY_DELAY:
+                    raise RuntimeError("Robot SSH unreachable, retrying later")
+
+                ssh = paramiko.SSHClient()
+                ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+                robot_host = self._get_robot_host()
+                try:
+                    await loop.run_in_executor(None, lambda: ssh.connect(
+                        robot_host,
+                        username=ROBOT_USER,
+                        password=ROBOT_PASSWORD,
+                        timeout=5
+                    ))
+                except Exception:
+                    self._ssh_failed_at = loop.time()
+                    raise
+                self._ssh_failed_at = None
+                ssh.get_transport().set_keepalive(15)
+                self._ssh = ssh
+
+                # Find clips already staged on the robot (tmp is cleared on reboot)
+                try:
+                    _, listing = await loop.run_in_executor(
+                        None, lambda: self._run_command(ssh, f"ls -tr {ROBOT_TTS_DIR}")
+                    )
+                    self._remote_cache = OrderedDict(
+                        (name[:-len(".mp3")], None) for name in listing.split() if name.endswith(".mp3")
+                    )
+                except Exception:
+                    self._remote_cache = OrderedDict()
+
+            return self._ssh
+
+    async def _get_sftp_client(self):
+        """Get an SFTP channel on the cached SSH connection."""
+        ssh = await self._get_ssh_client()
+        if self._sftp is None:
+            loop = asyncio.get_running_loop()
+            self._sftp = await loop.run_in_executor(None, ssh.open_sftp)
+        return self._sftp
+
+    def _close_ssh(self):
+        """Close the cached SSH connection, if any."""
+        if self._sftp is not None:
+            try:
+                self._sftp.close()
+            except Exception:
+                pass
+            self._sftp = None
+        if self._ssh is not None:
+            try:
+                self._ssh.close()
+            except Exception:
+                pass
+            self._ssh = None
+
+    async def _reset_ssh(self, ssh):
+        """Drop a broken SSH connection so the next call reconnects (unless it already has)."""
+        if ssh is None:
+            return
+        async with self._ssh_lock:
+            if self._ssh is ssh:
+                self._close_ssh()
+
+    async def close(self):
+        """Release persistent connections on shutdown."""
+        async with self._ssh_lock:
+            self._close_ssh()
+
+    def _mark_staged(self, key: str):
+        """Record a clip as staged on the robot, forgetting those the remote side prunes."""
+        self._remote_cache[key] = None
+        self._remote_cache.move_to_end(key)
+        while len(self._remote_cache) > ROBOT_TTS_MAX_CLIPS:
+            self._remote_cache.popitem(last=False)
+
     def clean_text_for_speech(self, text: str) -> str:
         """Remove action brackets and clean text for TTS."""
-        text = re.sub(r'\s*\[[^\]]+\]\s*', ' ', text)
-        text = re.sub(r'\*[^*]+\*', '', text)
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _ACTION_BRACKET_RE.sub(' ', text)
+        text = _EMPHASIS_RE.sub('', text)
+        text = _WHITESPACE_RE.sub(' ', text).strip()
         return text
 
+    def _cache_key(self, clean_text: str) -> str:
+        """Cache key for a clip of speech with the current voice settings."""
+        return hashlib.sha1(f"{self.voice_id}|{self.model_id}|{clean_text}".encode()).hexdigest()
+
+    async def _get_cached_audio(self, key: str) -> Optional[bytes]:
+        """Look up generated audio in the memory cache, then on disk."""
+        audio_data = self._tts_cache.get(key)
+        if audio_data is not None:
+            self._tts_cache.move_to_end(key)
+            return audio_data
+
+        cache_file = TTS_CACHE_DIR / f"{key}.mp3"
+        if not cache_file.exists():
+            return None
+        try:
+            audio_data = await asyncio.to_thread(self._read_cache_file, cache_file)
+        except Exception:
+            return None
+        self._remember_audio(key, audio_data)
+        return audio_data
+
+    @staticmethod
+    def _read_cache_file(cache_file: Path) -> bytes:
+        """Read a cached clip and mark it recently used (blocking)."""
+        audio_data = cache_file.read_bytes()
+        os.utime(cache_file)
+        return audio_data
+
+    @staticmethod
+    def _write_cache_file(cache_file: Path, audio_data: bytes):
+        """Write a clip to the disk cache and evict the least recently used ones (blocking)."""
+        cache_file.write_bytes(audio_data)
+
+        files = list(TTS_CACHE_DIR.glob("*.mp3"))
+        excess = len(files) - TTS_DISK_CACHE_MAX_FILES
+        if excess <= 0:
+            return
+        files.sort(key=lambda f: f.stat().st_mtime)
+        for stale in files[:excess]:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+    def _remember_audio(self, key: str, audio_data: bytes):
+        """Add audio to the in-memory LRU cache."""
+        self._tts_cache[key] = audio_data
+        self._tts_cache.move_to_end(key)
+        while len(self._tts_cache) > TTS_MEMORY_CACHE_SIZE:
+            self._tts_cache.popitem(last=False)
+
+    async def _store_cached_audio(self, key: str, audio_data: bytes):
+        """Cache generated audio in memory and on disk."""
+        if not audio_data:
+            return
+        self._remember_audio(key, audio_data)
+        try:
+            await asyncio.to_thread(self._write_cache_file, TTS_CACHE_DIR / f"{key}.mp3", audio_data)
+        except Exception as e:
+            print(f"[TTS] Failed to write cache file: {e}")
+
     async def speak(self, text: str) -> dict:
         """Convert text to speech and play on robot."""
         if not self.enabled:
@@ -58,26 +327,53 @@ class TTSService:
             return {"success": False, "message": "No text to speak"}
 
         try:
-            client = self._get_client()
-            if not client:
-                return {"success": False, "message": "ElevenLabs client not initialized"}
+            loop = asyncio.get_running_loop()
+            cache_key = self._cache_key(clean_text)
 
-            # Generate audio from ElevenLabs
-            loop = asyncio.get_event_loop()
-            audio_generator = await loop.run_in_executor(
-                None,
-                lambda: client.text_to_speech.convert(
-                    voice_id=self.voice_id,
-                    text=clean_text,
-                    model_id=self.model_id,
-                    output_format="mp3_44100_128"
+            # Already on the robot: just play it, no generation or transfer
+            if cache_key in self._remote_cache:
+                result = await self._play_staged_on_robot(cache_key)
+                if result["success"]:
+                    return result
+
+            cached_audio = await self._get_cached_audio(cache_key)
+
+            if cached_audio is not None:
+                audio_generator = iter([cached_audio])
+            else:
+                client = self._get_client()
+                if not client:
+                    return {"success": False, "message": "ElevenLabs client not initialized"}
+
+                # Generate audio from ElevenLabs
+                audio_generator = await loop.run_in_executor(
+                    None,
+                    lambda: client.text_to_speech.convert(
+                        voice_id=self.voice_id,
+                        text=clean_text,
+                        model_id=self.model_id,
+                        output_format="mp3_44100_128"
+                    )
                 )
-            )
 
-            # Collect audio bytes from generator
-            audio_data = b"".join(chunk for chunk in audio_generator)
+            # Stream chunks to the robot's player while they are generated
+            audio = _AudioStream(audio_generator)
+            result = await self._stream_on_robot(audio, cache_key)
+            if result["success"]:
+                # Only a clip the generator finished is worth replaying
+                if cached_audio is None and audio.complete:
+                    await self._store_cached_audio(cache_key, b"".join(audio.received))
+                return result
+
+            # Collect the full audio (including anything not yet generated) for the fallbacks;
+            # a generation error raises here rather than falling back with partial audio
+            audio_data = await loop.run_in_executor(None, audio.read_all)
+            if not audio_data:
+                return {"success": False, "message": "TTS returned no audio"}
+            if cached_audio is None:
+                await self._store_cached_audio(cache_key, audio_data)
 
-            # Try to play on robot via SSH
+            # Try to play on robot via file transfer
             result = await self._play_on_robot(audio_data)
             if result["success"]:
                 return result
@@ -89,93 +385,235 @@ class TTSService:
             print(f"[TTS] Error: {e}")
             return {"success": False, "message": f"TTS error: {str(e)}"}
 
-    async def _play_on_robot(self, audio_data: bytes) -> dict:
-        """Play audio on robot via Reachy SDK."""
+    async def _play_staged_on_robot(self, key: str) -> dict:
+        """Play a clip that is already staged on the robot, skipping the transfer."""
+        ssh = None
         try:
-            import paramiko
-            from scp import SCPClient
-
-            # Transfer file to robot first
-            temp_file = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False)
-            temp_file.write(audio_data)
-            temp_file.close()
-            local_path = temp_file.name
-            remote_path = "/tmp/tts_speech.mp3"
+            ssh = await self._get_ssh_client()
+            loop = asyncio.get_running_loop()
+            channel, exit_status = await loop.run_in_executor(
+                None,
+                lambda: self._start_player(ssh, ROBOT_STAGED_PLAY_CMD.format(key=key))
+            )
+            if channel is None and exit_status != 0:
+                self._remote_cache.pop(key, None)
+                return {"success": False, "message": f"Staged clip unavailable (status {exit_status})"}
+            # touch in the play command makes this the most recently used clip remotely too
+            self._mark_staged(key)
+            if channel is not None:
+                self._watch_player(channel, key)
+            return {"success": True, "message": "Playing staged clip on robot speakers"}
 
-            # Connect and transfer
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        except Exception as e:
+            if isinstance(e, SSH_ERRORS):
+                await self._reset_ssh(ssh)
+            self._remote_cache.pop(key, None)
+            print(f"[TTS] Staged playback failed: {e}")
+            return {"success": False, "message": str(e)}
 
-            robot_host = self._get_robot_host()
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, lambda: ssh.connect(
-                robot_host,
-                username=ROBOT_USER,
-                password=ROBOT_PASSWORD,
-                timeout=5
-            ))
+    async def _stream_on_robot(self, audio: _AudioStream, key: str) -> dict:
+        """
+        Play audio on robot by piping chunks into a remote player as they arrive.
 
-            # SCP the file
-            with SCPClient(ssh.get_transport()) as scp:
-                await loop.run_in_executor(None, lambda: scp.put(local_path, remote_path))
+        Errors from generating the audio are raised; only playback failures
+        are returned, so the caller can fall back with the complete clip.
+        """
+        ssh = None
+        try:
+            ssh = await self._get_ssh_client()
+            loop = asyncio.get_running_loop()
+            channel, exit_status = await loop.run_in_executor(
+                None,
+                lambda: self._start_player(ssh, ROBOT_STREAM_PLAY_CMD.format(key=key), audio)
+            )
+            if channel is None:
+                if exit_status != 0:
+                    return {"success": False, "message": f"Robot player exited with status {exit_status}"}
+                self._run_in_background(self._stage_clip(key))
+            else:
+                # The clip is staged once the player exits cleanly
+                self._watch_player(channel, key, stage=True)
+            return {"success": True, "message": "Streamed to robot speakers"}
 
-            ssh.close()
+        except Exception as e:
+            if audio.error is not None:
+                raise
+            if isinstance(e, SSH_ERRORS):
+                await self._reset_ssh(ssh)
+            print(f"[TTS] Robot streaming failed: {e}")
+            return {"success": False, "message": str(e)}
 
-            # Cleanup local temp file
-            asyncio.create_task(self._cleanup_file(local_path, delay=2.0))
+    @staticmethod
+    def _run_command(ssh, command: str):
+        """Run a remote command and return its exit status and output (blocking)."""
+        channel = ssh.get_transport().open_session()
+        try:
+            channel.exec_command(command)
+            output = channel.makefile("rb").read().decode(errors="replace")
+            return channel.recv_exit_status(), output
+        finally:
+            channel.close()
+
+    @staticmethod
+    def _start_player(ssh, command: str, chunks=()):
+        """
+        Start a remote player, feed it chunks on stdin and close stdin (blocking).
+
+        Returns (channel, None) while the player is still running, or
+        (None, exit_status) if it already exited, e.g. because it failed to start.
+        """
+        channel = ssh.get_transport().open_session()
+        try:
+            channel.exec_command(command)
+            for chunk in chunks:
+                channel.sendall(chunk)
+            channel.shutdown_write()
+            channel.status_event.wait(PLAYER_START_WAIT)
+            if not channel.exit_status_ready():
+                return channel, None
+            exit_status = channel.recv_exit_status()
+        except Exception:
+            channel.close()
+            raise
+        channel.close()
+        return None, exit_status
+
+    def _run_in_background(self, coro):
+        """Run a playback follow-up without making speak() wait for it."""
+        task = asyncio.create_task(coro)
+        self._player_tasks.add(task)
+        task.add_done_callback(self._player_task_done)
+
+    def _player_task_done(self, task: asyncio.Task):
+        """Drop a finished background task, reporting it if it failed."""
+        self._player_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[TTS] Background playback task failed: {task.exception()}")
+
+    def _watch_player(self, channel, key: Optional[str] = None, stage: bool = False):
+        """Collect a remote player's exit status in the background so speak() needn't wait for playback."""
+        self._run_in_background(self._finish_player(channel, key, stage))
+
+    async def _finish_player(self, channel, key: Optional[str], stage: bool):
+        """Wait for a remote player to exit and keep the staged-clip set in step with the result."""
+        try:
+            # Poll rather than block an executor thread for the whole clip
+            while not channel.exit_status_ready():
+                await asyncio.sleep(PLAYER_POLL_INTERVAL)
+            exit_status = channel.recv_exit_status()
+        finally:
+            channel.close()
+
+        if exit_status == 0:
+            if stage:
+                await self._stage_clip(key)
+            elif key:
+                self._mark_staged(key)
+        else:
+            print(f"[TTS] Robot player exited with status {exit_status}")
+            if key:
+                self._remote_cache.pop(key, None)
+
+    async def _stage_clip(self, key: str):
+        """Keep a streamed clip on the robot for replay (the stream must have finished cleanly)."""
+        ssh = self._ssh
+        if ssh is None:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            exit_status, _ = await loop.run_in_executor(
+                None, lambda: self._run_command(ssh, ROBOT_STAGE_CMD.format(key=key))
+            )
+        except Exception as e:
+            print(f"[TTS] Staging clip on robot failed: {e}")
+            return
+        if exit_status == 0:
+            self._mark_staged(key)
 
-            # Use Reachy SDK to play (same process has audio device)
+    async def _play_on_robot(self, audio_data: bytes) -> dict:
+        """Play audio on robot via Reachy SDK."""
+        try:
             robot = self._get_robot_service()
-            if robot.mini and hasattr(robot.mini, 'media'):
-                print(f"[TTS] Playing via Reachy SDK: {remote_path}")
-                await loop.run_in_executor(None, lambda: robot.mini.media.play_sound(remote_path))
-                return {"success": True, "message": "Playing on robot speakers via SDK"}
-            else:
+            if not (robot.mini and hasattr(robot.mini, 'media')):
                 print("[TTS] Reachy SDK not available, trying SSH playback")
                 # Fallback to SSH-based playback
-                return await self._play_via_ssh(remote_path)
+                return await self._play_via_ssh(audio_data)
+
+            remote_path = "/tmp/tts_speech.mp3"
+
+            # Upload straight from memory over the persistent SFTP channel
+            sftp = await self._get_sftp_client()
+            ssh = self._ssh
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(
+                    None, lambda: sftp.putfo(io.BytesIO(audio_data), remote_path)
+                )
+            except SSH_ERRORS:
+                # Drop the connection so the next call reconnects
+                await self._reset_ssh(ssh)
+                raise
+
+            # Use Reachy SDK to play (same process has audio device)
+            print(f"[TTS] Playing via Reachy SDK: {remote_path}")
+            await loop.run_in_executor(None, lambda: robot.mini.media.play_sound(remote_path))
+            return {"success": True, "message": "Playing on robot speakers via SDK"}
 
         except Exception as e:
             print(f"[TTS] Robot playback failed: {e}")
             return {"success": False, "message": str(e)}
 
-    async def _play_via_ssh(self, remote_path: str) -> dict:
-        """Fallback: Play audio via SSH command."""
+    async def _play_via_ssh(self, audio_data: bytes) -> dict:
+        """Fallback: Play audio via SSH command, sending it on the player's stdin."""
+        ssh = None
         try:
-            import paramiko
-
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
-            robot_host = self._get_robot_host()
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, lambda: ssh.connect(
-                robot_host,
-                username=ROBOT_USER,
-                password=ROBOT_PASSWORD,
-                timeout=5
-            ))
-
-            play_cmd = f"gst-play-1.0 {remote_path} 2>&1"
-            stdin, stdout, stderr = ssh.exec_command(play_cmd)
-            exit_status = stdout.channel.recv_exit_status()
-            ssh.close()
+            ssh = await self._get_ssh_client()
+            loop = asyncio.get_running_loop()
+            channel, exit_status = await loop.run_in_executor(
+                None,
+                lambda: self._start_player(ssh, ROBOT_PIPE_PLAY_CMD, [audio_data])
+            )
+            if channel is None and exit_status != 0:
+                return {"success": False, "message": f"Robot player exited with status {exit_status}"}
+            if channel is not None:
+                self._watch_player(channel)
 
             return {"success": True, "message": "Playing via SSH"}
         except Exception as e:
+            if isinstance(e, SSH_ERRORS):
+                await self._reset_ssh(ssh)
             return {"success": False, "message": str(e)}
 
     async def _play_local(self, audio_data: bytes, text: str) -> dict:
         """Play audio locally on Mac as fallback."""
         try:
+            # Pipe straight into a player when one that reads stdin is installed
+            player = next((cmd for cmd in LOCAL_STDIN_PLAYERS if shutil.which(cmd[0])), None)
+            if player:
+                proc = await asyncio.create_subprocess_exec(
+                    *player,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+                proc.stdin.write(audio_data)
+                await proc.stdin.drain()
+                proc.stdin.close()
+                self._run_in_background(proc.wait())
+
+                return {
+                    "success": True,
+                    "message": f"Playing locally: {text[:50]}...",
+                    "audio_size": len(audio_data)
+                }
+
+            # afplay cannot read stdin, so it still needs a temp file
             temp_file = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False)
             temp_file.write(audio_data)
             temp_file.close()
 
-            import subprocess
-            subprocess.Popen(['afplay', temp_file.name])
-
-            asyncio.create_task(self._cleanup_file(temp_file.name, delay=10.0))
+            proc = await asyncio.create_subprocess_exec('afplay', temp_file.name)
+            self._run_in_background(self._cleanup_file(temp_file.name, proc))
 
             return {
                 "success": True,
@@ -185,13 +623,15 @@ class TTSService:
         except Exception as e:
             return {"success": False, "message": str(e)}
 
-    async def _cleanup_file(self, filepath: str, delay: float = 5.0):
-        """Clean up temporary file after delay."""
-        await asyncio.sleep(delay)
+    async def _cleanup_file(self, filepath: str, proc):
+        """Clean up a temporary file once the player reading it has exited."""
         try:
-            os.unlink(filepath)
-        except Exception:
-            pass
+            await proc.wait()
+        finally:
+            try:
+                os.unlink(filepath)
+            except Exception:
+                pass
 
 
 tts_service = TTSService()
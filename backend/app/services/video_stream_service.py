@@ -1,14 +1,37 @@
 """Video streaming service for high FPS camera streaming via WebSocket."""
 
 import asyncio
-import base64
-import io
+import logging
+import struct
 import time
-from typing import Callable, Optional, Set
-from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+from dataclasses import dataclass, replace
 
 import numpy as np
 
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJFLAG_FASTDCT
+except ImportError:
+    TurboJPEG = None
+
+logger = logging.getLogger(__name__)
+
+
+# Adaptive quality: back off when encoding takes most of the per-frame budget,
+# recover once it fits comfortably again
+QUALITY_STEP = 10
+MIN_ADAPTIVE_QUALITY = 30
+ENCODE_HIGH_LOAD = 0.8
+ENCODE_LOW_LOAD = 0.5
+
+
+# Status message sent when the camera stops yielding frames
+NO_FRAME_MESSAGE = {"error": "No frames available from camera", "fps": 0}
+
+
+# Header prepended to each binary frame message: width, height (uint16), fps (float32)
+FRAME_HEADER = struct.Struct('<HHf')
+
 
 @dataclass
 class StreamConfig:
@@ -23,15 +46,43 @@ class VideoStreamService:
     """Service for streaming video from robot camera at high FPS."""
 
     def __init__(self):
-        self._subscribers: Set[Callable] = set()
+        # Subscribers are non-blocking callbacks (the WebSocket handler queues frames itself).
+        # Broadcast iterates a tuple snapshot that is rebuilt only on (un)subscribe.
+        self._subscribers: Tuple[Callable, ...] = ()
         self._is_streaming = False
         self._stream_task: Optional[asyncio.Task] = None
+        # Robot media handle, resolved once per stream and re-resolved after a miss
+        self._media = None
         self._config = StreamConfig()
+        # Quality the user asked for; the adaptive controller never goes above it
+        self._max_quality = self._config.quality
+        # Encode time summed over the current adaptation window (about a second of frames)
+        self._encode_time = 0.0
+        self._encode_frames = 0
         self._frame_count = 0
-        self._last_fps_time = time.time()
+        self._last_fps_time = time.monotonic()
         self._actual_fps = 0.0
+        # Set while the camera is yielding no frames; the error is sent once per outage
+        self._no_frame = False
+        self._tj = self._load_turbojpeg()
+        # Resize step for the current camera, bound from its first frame (see _bind_resize)
+        self._resize: Optional[Callable[[np.ndarray], np.ndarray]] = None
+        # Packed header reused until the resolution or displayed fps changes
+        self._frame_header_key: Optional[tuple] = None
+        self._frame_header = b""
+
+    @staticmethod
+    def _load_turbojpeg():
+        """Load libturbojpeg if available (needs the system library as well as the package)."""
+        if TurboJPEG is None:
+            return None
+        try:
+            return TurboJPEG()
+        except Exception as e:
+            logger.info("TurboJPEG unavailable, using OpenCV encoder: %s", e)
+            return None
 
-    def configure(self, target_fps: int = 30, quality: int = 70,
+    def configure(self, target_fps: int = 60, quality: int = 60,
                   max_width: int = 640, max_height: int = 480):
         """Configure stream parameters."""
         self._config = StreamConfig(
@@ -40,6 +91,10 @@ class VideoStreamService:
             max_width=max_width,
             max_height=max_height
         )
+        self._max_quality = quality
+        # New max dimensions: work the resize out again on the next frame
+        self._resize = None
+        self._reset_encode_window()
 
     @property
     def is_streaming(self) -> bool:
@@ -54,12 +109,19 @@ class VideoStreamService:
         return len(self._subscribers)
 
     def subscribe(self, callback: Callable):
-        """Subscribe to video frames."""
-        self._subscribers.add(callback)
+        """Subscribe to video frames with a callback that must not block (e.g. a queue put)."""
+        if asyncio.iscoroutinefunction(callback):
+            raise TypeError("Video frame callbacks must be plain functions, not coroutines")
+        if callback in self._subscribers:
+            return
+        self._subscribers = self._subscribers + (callback,)
+        # Someone joining mid-outage would otherwise only ever see keepalives
+        if self._no_frame:
+            callback(NO_FRAME_MESSAGE)
 
     def unsubscribe(self, callback: Callable):
         """Unsubscribe from video frames."""
-        self._subscribers.discard(callback)
+        self._subscribers = tuple(cb for cb in self._subscribers if cb is not callback)
 
     async def start_streaming(self):
         """Start the video streaming loop."""
@@ -67,8 +129,11 @@ class VideoStreamService:
             return
 
         self._is_streaming = True
+        self._no_frame = False
         self._frame_count = 0
-        self._last_fps_time = time.time()
+        self._last_fps_time = time.monotonic()
+        self._resize = None
+        self._reset_encode_window()
         self._stream_task = asyncio.create_task(self._stream_loop())
 
     async def stop_streaming(self):
@@ -81,6 +146,8 @@ class VideoStreamService:
             except asyncio.CancelledError:
                 pass
             self._stream_task = None
+        self._media = None
+        self._no_frame = False
 
     async def _stream_loop(self):
         """Main streaming loop that captures and broadcasts frames."""
@@ -89,23 +156,27 @@ class VideoStreamService:
         frame_interval = 1.0 / self._config.target_fps
         consecutive_failures = 0
         max_failures = 10
+        # Local bindings for the per-frame calls; monotonic is immune to clock adjustments
+        mono = time.monotonic
+        sleep = asyncio.sleep
 
         # Ensure camera is started
-        if robot_service.connected and robot_service.mini and hasattr(robot_service.mini, 'media'):
+        if robot_service.connected and self._resolve_media(robot_service):
             if not robot_service._camera_started:
-                print("Starting camera for video stream...")
+                logger.info("Starting camera for video stream...")
                 await robot_service.start_camera()
                 await asyncio.sleep(0.5)
+            self._media = self._resolve_media(robot_service)
         else:
-            print("Robot not connected or no media available for video stream")
+            logger.warning("Robot not connected or no media available for video stream")
 
         while self._is_streaming:
-            loop_start = time.time()
+            loop_start = mono()
 
             try:
                 if not self._subscribers:
                     # No subscribers, slow down
-                    await asyncio.sleep(0.1)
+                    await sleep(0.1)
                     continue
 
                 # Capture frame
@@ -113,12 +184,14 @@ class VideoStreamService:
 
                 if frame_data:
                     consecutive_failures = 0
+                    # The frame itself tells clients the outage is over
+                    self._no_frame = False
                     # Broadcast to all subscribers
-                    await self._broadcast_frame(frame_data)
+                    self._broadcast_frame(frame_data)
 
                     # Update FPS counter
                     self._frame_count += 1
-                    now = time.time()
+                    now = mono()
                     elapsed = now - self._last_fps_time
                     if elapsed >= 1.0:
                         self._actual_fps = self._frame_count / elapsed
@@ -127,112 +200,190 @@ class VideoStreamService:
                 else:
                     consecutive_failures += 1
                     if consecutive_failures >= max_failures:
-                        # Send error message to subscribers
-                        await self._broadcast_frame({
-                            "error": "No frames available from camera",
-                            "fps": 0
-                        })
+                        # Tell subscribers once rather than repeating it every second
+                        if not self._no_frame:
+                            self._no_frame = True
+                            self._broadcast_frame(NO_FRAME_MESSAGE)
                         consecutive_failures = 0
-                        await asyncio.sleep(1.0)
+                        await sleep(1.0)
                         continue
 
-            except Exception as e:
-                print(f"Stream loop error: {e}")
+            except Exception:
+                logger.exception("Stream loop error")
                 consecutive_failures += 1
 
             # Maintain target FPS
-            elapsed = time.time() - loop_start
-            sleep_time = max(0, frame_interval - elapsed)
+            elapsed = mono() - loop_start
+            sleep_time = frame_interval - elapsed
             if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
+                await sleep(sleep_time)
+
+    def _reset_encode_window(self):
+        self._encode_time = 0.0
+        self._encode_frames = 0
+
+    def _adapt_quality(self):
+        """Trade JPEG quality for frame rate when encoding can't keep up."""
+        config = self._config
+        # Mean encode time as a fraction of the frame budget (1 / target_fps)
+        load = self._encode_time / self._encode_frames * config.target_fps
+        self._reset_encode_window()
+        # The gap between the two loads is the hysteresis band that prevents oscillation
+        if load > ENCODE_HIGH_LOAD and config.quality > MIN_ADAPTIVE_QUALITY:
+            quality = max(MIN_ADAPTIVE_QUALITY, config.quality - QUALITY_STEP)
+        elif load < ENCODE_LOW_LOAD and config.quality < self._max_quality:
+            quality = min(self._max_quality, config.quality + QUALITY_STEP)
+        else:
+            return
+        self._config = replace(config, quality=quality)
 
     async def _capture_frame(self, robot_service) -> Optional[dict]:
         """Capture and encode a single frame."""
         try:
-            frame = None
-
-            # Try WebRTC camera first
-            if robot_service.mini and hasattr(robot_service.mini, 'media'):
-                media = robot_service.mini.media
-                if media:
-                    frame = media.get_frame()
-
+            media = self._media
+            if media is None:
+                media = self._media = self._resolve_media(robot_service)
+                if media is None:
+                    return None
+                # A reconnected camera may come back at another resolution
+                self._resize = None
+                self._reset_encode_window()
+
+            frame = media.get_frame()
             if frame is None:
+                # The robot may have reconnected; look the media handle up again next time
+                self._media = None
+                self._reset_encode_window()
                 return None
 
-            # Resize if needed
-            frame = self._resize_frame(frame)
+            resize = self._resize
+            if resize is None:
+                resize = self._resize = self._bind_resize(frame)
 
-            # Encode to JPEG
-            img_b64 = self._encode_frame(frame)
+            # Resize and encode in a worker thread (OpenCV/libjpeg release the GIL)
+            jpeg_bytes, width, height, encode_time = await asyncio.to_thread(
+                self._encode_pipeline, frame, resize
+            )
+            self._encode_time += encode_time
+            self._encode_frames += 1
+            if self._encode_frames >= self._config.target_fps:
+                self._adapt_quality()
 
             return {
-                "image_base64": img_b64,
-                "format": "jpeg",
-                "width": frame.shape[1],
-                "height": frame.shape[0],
-                "fps": round(self._actual_fps, 1)
+                "header": self._get_frame_header(width, height),
+                "jpeg_bytes": jpeg_bytes,
             }
 
         except Exception as e:
-            print(f"Frame capture error: {e}")
+            logger.warning("Frame capture error: %s", e)
+            self._media = None
+            self._reset_encode_window()
             return None
 
-    def _resize_frame(self, frame: np.ndarray) -> np.ndarray:
-        """Resize frame if it exceeds max dimensions."""
+    @staticmethod
+    def _resolve_media(robot_service):
+        """Look up the robot's media handle, or None if there isn't one."""
+        mini = robot_service.mini
+        return getattr(mini, 'media', None) if mini else None
+
+    def _get_frame_header(self, width: int, height: int) -> bytes:
+        """Return the binary frame header, repacking only when its fields change."""
+        key = (width, height, round(self._actual_fps, 1))
+        if key != self._frame_header_key:
+            self._frame_header_key = key
+            self._frame_header = FRAME_HEADER.pack(*key)
+        return self._frame_header
+
+    def _encode_pipeline(self, frame: np.ndarray,
+                         resize: Callable[[np.ndarray], np.ndarray]) -> tuple[bytes, int, int, float]:
+        """Resize and JPEG-encode a frame; returns (JPEG bytes, width, height, seconds taken)."""
+        start = time.perf_counter()
+        frame = resize(frame)
+        jpeg_bytes = self._encode_frame(frame)
+        return jpeg_bytes, frame.shape[1], frame.shape[0], time.perf_counter() - start
+
+    @staticmethod
+    def _identity(frame: np.ndarray) -> np.ndarray:
+        return frame
+
+    def _bind_resize(self, frame: np.ndarray) -> Callable[[np.ndarray], np.ndarray]:
+        """Work out once how to fit frames shaped like this one into the max dimensions.
+
+        The camera's resolution is fixed while its media handle lives, so the size
+        check, scale and output buffer don't need recomputing for every frame.
+        """
         import cv2
 
         h, w = frame.shape[:2]
         max_w, max_h = self._config.max_width, self._config.max_height
 
         if w <= max_w and h <= max_h:
-            return frame
+            return self._identity
 
         # Calculate scale
         scale = min(max_w / w, max_h / h)
-        new_w, new_h = int(w * scale), int(h * scale)
+        size = (int(w * scale), int(h * scale))
 
-        return cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA)
+        # Reuse one output buffer instead of allocating a new frame every time
+        dst = np.empty((size[1], size[0]) + frame.shape[2:], dtype=frame.dtype)
 
-    def _encode_frame(self, frame: np.ndarray) -> str:
-        """Encode frame to base64 JPEG."""
-        import cv2
+        # INTER_LINEAR is faster and indistinguishable for mild downscales;
+        # INTER_AREA avoids aliasing when shrinking by more than half
+        interpolation = cv2.INTER_LINEAR if scale > 0.5 else cv2.INTER_AREA
+        resize = cv2.resize
+
+        def resize_frame(frame: np.ndarray) -> np.ndarray:
+            return resize(frame, size, dst=dst, interpolation=interpolation)
+
+        return resize_frame
 
-        # Convert BGR to RGB if needed
-        if len(frame.shape) == 3 and frame.shape[2] == 3:
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    def _encode_frame(self, frame: np.ndarray) -> bytes:
+        """Encode frame to JPEG."""
+        if self._tj is not None:
+            # Colour conversion and DCT in one SIMD pass straight from BGR
+            jpeg_bytes = self._tj.encode(
+                frame,
+                quality=self._config.quality,
+                pixel_format=TJPF_BGR,
+                flags=TJFLAG_FASTDCT
+            )
+            return jpeg_bytes
 
-        # Encode to JPEG
-        from PIL import Image
-        img = Image.fromarray(frame)
-        buffer = io.BytesIO()
-        img.save(buffer, format='JPEG', quality=self._config.quality)
-        img_bytes = buffer.getvalue()
+        import cv2
+
+        # OpenCV's libjpeg-turbo encoder takes the camera's BGR frame as-is
+        ok, buffer = cv2.imencode('.jpg', frame, [
+            int(cv2.IMWRITE_JPEG_QUALITY), self._config.quality,
+            int(cv2.IMWRITE_JPEG_OPTIMIZE), 0
+        ])
+        if not ok:
+            raise ValueError("JPEG encoding failed")
 
-        return base64.b64encode(img_bytes).decode('utf-8')
+        return buffer.tobytes()
 
-    async def _broadcast_frame(self, frame_data: dict):
-        """Broadcast frame to all subscribers."""
-        dead_subscribers = []
+    def _broadcast_frame(self, frame_data: dict):
+        """Hand a frame to every subscriber.
 
-        for callback in self._subscribers.copy():
+        Never blocks: subscribers only enqueue the frame, and their own tasks do the
+        WebSocket sends, so capture/encode overlaps with sending.
+        """
+        for callback in self._subscribers:
             try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(frame_data)
-                else:
-                    callback(frame_data)
+                callback(frame_data)
             except Exception as e:
-                print(f"Subscriber callback error: {e}")
-                dead_subscribers.append(callback)
+                logger.warning("Subscriber callback error: %s", e)
+                self.unsubscribe(callback)
 
-        # Remove dead subscribers
-        for sub in dead_subscribers:
-            self._subscribers.discard(sub)
+    @staticmethod
+    def pack_frame(frame_data: dict) -> bytes:
+        """Pack a captured frame as a binary WebSocket message (header + raw JPEG)."""
+        return frame_data["header"] + frame_data["jpeg_bytes"]
 
     def get_status(self) -> dict:
         """Get current streaming status."""
         return {
             "streaming": self._is_streaming,
+            "status": "no_frame" if self._no_frame else "ok",
             "subscribers": len(self._subscribers),
             "actual_fps": round(self._actual_fps, 1),
             "target_fps": self._config.target_fps,
@@ -4,12 +4,15 @@ Main service that coordinates STT, command parsing, Claude Code execution,
 TTS response, and robot feedback.
 """
 import asyncio
+import logging
 import numpy as np
 from typing import Callable, List, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 class VoiceControlState(Enum):
     """Overall voice control system state."""
@@ -43,6 +46,10 @@ class VoiceControlService:
         self._last_command: Optional[str] = None
         self._last_response: Optional[str] = None
 
+        # Scratch buffers for float -> 16-bit PCM conversion (grown if a chunk is larger)
+        self._pcm_buf = np.empty(self.AUDIO_CHUNK_SIZE, dtype=np.int16)
+        self._float_buf = np.empty(self.AUDIO_CHUNK_SIZE, dtype=np.float32)
+
         # Lazy-loaded service references
         self._stt_service = None
         self._command_parser = None
@@ -188,34 +195,42 @@ class VoiceControlService:
             return {"success": True, "message": "Already stopped"}
 
         try:
-            # Cancel audio loop
-            if self._audio_task:
-                self._audio_task.cancel()
-                try:
-                    await self._audio_task
-                except asyncio.CancelledError:
-                    pass
-                self._audio_task = None
-
-            # Stop STT
             stt = self._get_stt_service()
             stt.remove_transcript_callback(self._on_transcript)
-            await stt.stop_listening()
 
             # Reset parser
             parser = self._get_command_parser()
             parser.remove_command_callback(self._on_command)
             parser.reset()
 
+            # Shut the audio loop and the STT connection down concurrently
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._cancel_audio_task())
+                tg.create_task(stt.stop_listening())
+
             self._set_state(VoiceControlState.STOPPED)
             await self._emit_event("status", {"message": "Voice control stopped"})
 
             return {"success": True, "message": "Voice control stopped"}
 
+        except ExceptionGroup as eg:
+            self._set_state(VoiceControlState.ERROR)
+            errors = "; ".join(str(e) for e in eg.exceptions)
+            return {"success": False, "message": f"Stop failed: {errors}"}
         except Exception as e:
             self._set_state(VoiceControlState.ERROR)
             return {"success": False, "message": f"Stop failed: {str(e)}"}
 
+    async def _cancel_audio_task(self):
+        """Cancel the audio loop and wait for it to stop recording."""
+        task, self._audio_task = self._audio_task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
     async def execute_manual_command(self, command: str, use_claude_code: bool = True) -> dict:
         """Execute a command manually (for testing)."""
         if use_claude_code:
@@ -240,16 +255,13 @@ class VoiceControlService:
                     audio = await robot.get_audio_sample()
 
                     if audio is not None and len(audio) > 0:
-                        # Convert to bytes (16-bit PCM)
+                        # Convert to 16-bit PCM
                         if audio.dtype != np.int16:
-                            # Normalize and convert to int16
-                            if audio.dtype == np.float32 or audio.dtype == np.float64:
-                                audio = (audio * 32767).astype(np.int16)
-                            else:
-                                audio = audio.astype(np.int16)
+                            audio = self._to_pcm16(audio)
 
-                        audio_bytes = audio.tobytes()
-                        await stt.send_audio(audio_bytes)
+                        # Send a byte view of the samples rather than copying them into bytes;
+                        # send_audio consumes it before the scratch buffer is reused
+                        await stt.send_audio(memoryview(np.ascontiguousarray(audio)).cast('B'))
 
                     # Sleep for chunk duration (20 Hz)
                     await asyncio.sleep(self.AUDIO_CHUNK_DURATION)
@@ -257,13 +269,33 @@ class VoiceControlService:
                 except asyncio.CancelledError:
                     break
                 except Exception as e:
-                    print(f"[VoiceControl] Audio loop error: {e}")
+                    logger.warning("[VoiceControl] Audio loop error: %s", e)
                     await asyncio.sleep(0.1)
 
         finally:
             # Stop recording on robot
             await robot.stop_recording()
 
+    def _to_pcm16(self, audio: np.ndarray) -> np.ndarray:
+        """Convert an audio chunk to int16 PCM using the preallocated scratch buffers."""
+        n = audio.size
+        if n > self._pcm_buf.size:
+            self._pcm_buf = np.empty(n, dtype=np.int16)
+            self._float_buf = np.empty(n, dtype=np.float32)
+        pcm = self._pcm_buf[:n]
+
+        if audio.dtype == np.float32 or audio.dtype == np.float64:
+            # Normalize and convert to int16 without temporary arrays
+            scratch = self._float_buf[:n]
+            np.multiply(audio.reshape(-1), 32767.0, out=scratch, casting='same_kind')
+            np.rint(scratch, out=scratch)
+            np.clip(scratch, -32768, 32767, out=scratch)
+            np.copyto(pcm, scratch, casting='unsafe')
+        else:
+            np.copyto(pcm, audio.reshape(-1), casting='unsafe')
+
+        return pcm
+
     # ==================== Callbacks ====================
 
     async def _on_transcript(self, transcript: str, is_final: bool):
@@ -385,37 +417,35 @@ class VoiceControlService:
         if not output:
             return "Done."
 
-        lines = output.strip().split("\n")
-
         # Filter out code blocks, file paths, and technical output
         response_lines = []
         in_code_block = False
 
-        for line in lines:
+        for line in output.split("\n"):
             stripped = line.strip()
 
             # Skip code blocks
             if stripped.startswith("```"):
                 in_code_block = not in_code_block
                 continue
-            if in_code_block:
+            if in_code_block or len(stripped) <= 5:
                 continue
 
-            # Skip file paths and technical lines
-            if stripped.startswith("/") or stripped.startswith("./"):
-                continue
-            if "created" in stripped.lower() and "/" in stripped:
+            # Skip file paths, shell prompts and quoted output with one first-char test
+            first = stripped[0]
+            if first in "/$>" or (first == "." and stripped[1] == "/"):
                 continue
-            if stripped.startswith("$") or stripped.startswith(">"):
+            if "/" in stripped and "created" in stripped.lower():
                 continue
 
-            # Keep conversational lines
-            if stripped and len(stripped) > 5:
-                response_lines.append(stripped)
+            # Keep conversational lines; only the first few are spoken
+            response_lines.append(stripped)
+            if len(response_lines) == 3:
+                break
 
         if response_lines:
             # Return first few meaningful lines
-            response = " ".join(response_lines[:3])
+            response = " ".join(response_lines)
             # Truncate if too long
             if len(response) > 200:
                 response = response[:197] + "..."
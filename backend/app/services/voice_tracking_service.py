@@ -1,9 +1,34 @@
 import asyncio
+import logging
 import math
+import statistics
+from collections import deque
+from dataclasses import dataclass, replace
 from typing import Optional, Callable
 from ..config import get_settings
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Polling backoff after consecutive DoA failures: interval * 2**n, capped
+MAX_POLL_BACKOFF = 1.0
+MAX_POLL_FAILURES = 5
+
+# Adaptive pacing: never poll faster than the tracking interval, poll at ~70% of the
+# sensor's update interval when it is measured to be slower, and slow down (up to a cap)
+# once readings keep coming back unchanged
+POLL_RATE_FACTOR = 0.7
+POLL_SPEEDUP = 1.1  # While every poll sees a new reading, creep back toward the tracking interval
+STALE_POLLS_BEFORE_BACKOFF = 3  # More unchanged readings in a row than this is a silence
+MAX_STALE_POLL_INTERVAL = 0.25
+
+
+@dataclass(frozen=True)
+class TrackingParams:
+    """Tunable tracking parameters, swapped as a whole so readers see a consistent set."""
+    smoothing_factor: float = 0.4  # Smoothing per tracking interval for natural head movement
+    min_movement_threshold: float = 3.0  # Degrees to trigger movement (lowered for responsiveness)
+    head_deadband: float = 1.0  # Degrees; smaller changes are below servo resolution
 
 
 class VoiceTrackingService:
@@ -12,15 +37,40 @@ class VoiceTrackingService:
     to face the speaker, like natural human interaction.
     """
 
+    # Robot head can rotate about -40 to +40 degrees; keep a safety margin
+    _MAX_HEAD_ANGLE = 35.0
+    # Sound 90 degrees to the side maps to a full head turn
+    _SCALE = _MAX_HEAD_ANGLE / 90.0
+    # One smooth minjerk move per target; quick enough to keep up with a moving speaker
+    _MOVE_DURATION = 0.3
+
     def __init__(self):
         self._robot_service = None
         self._tracking_enabled = False
+        # One supervisor task owns a TaskGroup holding the DoA poller, the tracking
+        # loop and callback notifications, so teardown cancels them all together
         self._tracking_task: Optional[asyncio.Task] = None
+        self._task_group: Optional[asyncio.TaskGroup] = None
+        # Latest DoA sample from the producer; the tracking loop sleeps on the event
+        self._latest_voice_info: Optional[dict] = None
+        self._doa_ready = asyncio.Event()
         self._last_doa: Optional[float] = None
-        self._smoothing_factor = 0.4  # Smoothing for natural head movement
-        self._min_movement_threshold = 3.0  # Degrees to trigger movement (lowered for responsiveness)
-        self._tracking_interval = 0.05  # Check voice direction 20 times per second
-        self._callbacks: list[Callable] = []
+        self._last_doa_time: Optional[float] = None
+        self._doa_window: deque = deque(maxlen=5)  # Recent raw DoA samples for outlier rejection
+        self._now: Optional[Callable[[], float]] = None  # Bound loop.time while tracking
+        self._to_degrees: Callable[[float], float] = math.degrees  # Chosen from the robot's DoA unit
+        self._last_head_angle: Optional[float] = None  # Last angle actually sent to the head
+        # At most one head move runs at a time; newer targets replace any still waiting
+        self._pending_move: Optional[asyncio.Task] = None
+        self._next_target: Optional[float] = None
+        self._params = TrackingParams()
+        self._tracking_interval = 0.05  # Poll the DoA endpoint 20 times per second
+        # Callbacks are split by kind when registered so dispatch needs no introspection
+        self._sync_callbacks: list[Callable] = []
+        self._async_callbacks: list[Callable] = []
+        self._callback_tasks: set[asyncio.Task] = set()  # Notifications still being delivered
+        self._callback_min_interval = 0.2  # Subscribers don't need speech events faster than 5 Hz
+        self._last_callback_time = 0.0
         self._continuous_mode = True  # Track continuously, not just on speech detection
 
     def _get_robot_service(self):
@@ -32,24 +82,37 @@ class VoiceTrackingService:
 
     def add_callback(self, callback: Callable):
         """Add callback for voice detection events."""
-        self._callbacks.append(callback)
+        if asyncio.iscoroutinefunction(callback):
+            self._async_callbacks.append(callback)
+        else:
+            self._sync_callbacks.append(callback)
 
     def remove_callback(self, callback: Callable):
         """Remove callback."""
-        if callback in self._callbacks:
-            self._callbacks.remove(callback)
+        for callbacks in (self._sync_callbacks, self._async_callbacks):
+            if callback in callbacks:
+                callbacks.remove(callback)
 
     async def _notify_callbacks(self, event: dict):
         """Notify all callbacks of voice detection event."""
-        for callback in self._callbacks:
+        for callback in self._sync_callbacks:
             try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(event)
-                else:
-                    callback(event)
+                callback(event)
             except Exception:
                 pass
 
+        # Async callbacks run concurrently; errors are dropped like the sync ones
+        if self._async_callbacks:
+            await asyncio.gather(
+                *(callback(event) for callback in self._async_callbacks),
+                return_exceptions=True
+            )
+
+    @staticmethod
+    def _angdiff(a: float, b: float) -> float:
+        """Signed shortest difference a - b in degrees, wrapped to [-180, 180)."""
+        return (a - b + 180.0) % 360.0 - 180.0
+
     def doa_to_head_angle(self, doa: float) -> float:
         """
         Convert Direction of Arrival (DoA) to head yaw angle.
@@ -64,104 +127,285 @@ class VoiceTrackingService:
         - negative = looking left
         - positive = looking right
         """
-        # Clamp DoA to reasonable range for head movement
-        # Robot head typically can rotate about -40 to +40 degrees
-        max_head_angle = 35.0
-
-        # Scale DoA to head angle range
-        # If sound is at 90 degrees to the side, we want max head turn
-        scale_factor = max_head_angle / 90.0
-        head_angle = doa * scale_factor
+        head_angle = doa * self._SCALE
 
         # Clamp to safe range
-        head_angle = max(-max_head_angle, min(max_head_angle, head_angle))
-
+        limit = self._MAX_HEAD_ANGLE
+        if head_angle > limit:
+            return limit
+        if head_angle < -limit:
+            return -limit
         return head_angle
 
-    async def look_at_speaker(self, doa: float, smooth: bool = True) -> dict:
+    async def look_at_speaker(self, doa: float, smooth: bool = True, *, robot=None, wait: bool = False) -> dict:
         """
         Turn the robot's head towards the detected voice direction.
 
         Args:
             doa: Direction of arrival in degrees
             smooth: Whether to apply smoothing for natural movement
+            robot: Robot service already resolved by the caller, if any
+            wait: Wait for the head move to finish and report its outcome;
+                otherwise the move is only queued when this returns
         """
-        robot = self._get_robot_service()
+        if robot is None:
+            robot = self._get_robot_service()
 
         if not robot.connected:
             return {"success": False, "message": "Robot not connected"}
 
-        # Apply smoothing if we have a previous direction
-        if smooth and self._last_doa is not None:
-            doa = self._last_doa + self._smoothing_factor * (doa - self._last_doa)
+        params = self._params
+        now = (self._now or asyncio.get_running_loop().time)()
+
+        # Apply smoothing if we have a previous direction. The factor is defined per
+        # tracking interval and scaled to the real gap between samples, so jittery or
+        # bunched-up samples get the same low-pass behaviour as evenly spaced ones
+        # (equivalent to alpha = 1 - exp(-dt / tau) with tau = -interval / ln(1 - factor)).
+        if smooth and self._last_doa is not None and self._last_doa_time is not None:
+            dt = now - self._last_doa_time
+            alpha = 1.0 - (1.0 - params.smoothing_factor) ** (dt / self._tracking_interval)
+            # Blend along the short way round so -179° and 179° stay 2° apart
+            doa = self._angdiff(self._last_doa + alpha * self._angdiff(doa, self._last_doa), 0.0)
 
         self._last_doa = doa
+        self._last_doa_time = now
 
         # Convert DoA to head angle
         head_angle = self.doa_to_head_angle(doa)
 
-        # Move head to face speaker
-        # x controls left/right rotation
-        result = await robot.move_head(
-            x=head_angle,
-            y=0,
-            z=0,
-            duration=0.3,  # Quick but smooth movement
-            method="minjerk"
-        )
+        # Don't send a motion command the servos can't resolve
+        if self._last_head_angle is not None and abs(head_angle - self._last_head_angle) < params.head_deadband:
+            return {
+                "success": True,
+                "skipped": True,
+                "message": f"Already facing speaker at {doa:.1f}° (head: {self._last_head_angle:.1f}°)",
+                "doa": doa,
+                "head_angle": head_angle
+            }
+        self._last_head_angle = head_angle
+
+        # Queue the target; a move already in flight picks it up when it finishes
+        self._next_target = head_angle
+        if self._pending_move is None or self._pending_move.done():
+            self._pending_move = asyncio.create_task(self._drive_head(robot))
+
+        if wait:
+            task = self._pending_move
+            try:
+                # Shielded so a dropped request doesn't cancel the tracking loop's move
+                result = await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    raise
+                result = {"success": False, "message": "Head move was cancelled"}
+            if not result.get("success", False):
+                return {
+                    "success": False,
+                    "message": f"Head move failed: {result.get('message', 'unknown error')}",
+                    "doa": doa,
+                    "head_angle": head_angle
+                }
+            return {
+                "success": True,
+                "message": f"Looking towards speaker at {doa:.1f}° (head: {head_angle:.1f}°)",
+                "doa": doa,
+                "head_angle": head_angle
+            }
 
         return {
-            "success": result.get("success", False),
-            "message": f"Looking towards speaker at {doa:.1f}° (head: {head_angle:.1f}°)",
+            "success": True,
+            "queued": True,
+            "message": f"Queued head move towards speaker at {doa:.1f}° (head: {head_angle:.1f}°)",
             "doa": doa,
             "head_angle": head_angle
         }
 
-    async def _tracking_loop(self):
-        """Main tracking loop that continuously monitors voice direction."""
+    async def _drive_head(self, robot) -> dict:
+        """
+        Move the head to the newest target until no newer one is waiting.
+
+        Returns the result of the last move sent.
+        """
+        result = {"success": True, "message": "No head move pending"}
+        while self._next_target is not None:
+            head_angle, self._next_target = self._next_target, None
+
+            # Move head to face speaker
+            # x controls left/right rotation
+            result = await robot.move_head(
+                x=head_angle,
+                y=0,
+                z=0,
+                duration=self._MOVE_DURATION,  # Quick but smooth movement
+                method="minjerk"
+            )
+            if not result.get("success", False):
+                logger.warning(
+                    "[VoiceTracking] Head move to %.1f° failed: %s",
+                    head_angle, result.get("message", "unknown error")
+                )
+                # Let the next target be sent even if it's close to this one
+                self._last_head_angle = None
+        return result
+
+    async def _cancel_pending_move(self):
+        """Drop any queued head target and stop the move in flight."""
+        self._next_target = None
+        task, self._pending_move = self._pending_move, None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def push_doa(self, voice_info: dict):
+        """Hand a fresh DoA sample to the tracking loop (the latest sample wins)."""
+        self._latest_voice_info = voice_info
+        self._doa_ready.set()
+
+    async def _poll_doa(self):
+        """Producer that polls the robot's DoA sensor and pushes each sample."""
         robot = self._get_robot_service()
-        consecutive_detections = 0
+        failures = 0
+        paced = self._tracking_interval  # Poll interval matched to the sensor's update rate
+        interval = paced
+        last_info: Optional[dict] = None
+        last_change: Optional[float] = None
+        polls_since_change = 0
 
         while self._tracking_enabled:
             try:
-                # Get current voice direction from robot's DoA sensor
                 voice_info = await robot.get_voice_direction()
-
+                error = None if voice_info else "no DoA reading"
                 if voice_info:
-                    doa = voice_info.get("direction_of_arrival")
-                    speech_detected = voice_info.get("speech_detected", False)
-
-                    if doa is not None:
-                        # In continuous mode, always track the direction
-                        # In speech mode, only track when speech is detected
-                        should_track = self._continuous_mode or speech_detected
-
-                        if should_track:
-                            # Convert radians to degrees if needed (DoA from API is in radians)
-                            doa_degrees = math.degrees(doa) if abs(doa) < 10 else doa
-
-                            # Check if movement is significant enough
-                            if self._last_doa is None or abs(doa_degrees - self._last_doa) > self._min_movement_threshold:
-                                await self.look_at_speaker(doa_degrees)
-
-                                if speech_detected:
-                                    consecutive_detections += 1
-                                    await self._notify_callbacks({
-                                        "event": "speech_detected",
-                                        "doa": doa_degrees,
-                                        "head_angle": self.doa_to_head_angle(doa_degrees),
-                                        "consecutive": consecutive_detections
-                                    })
-                        else:
-                            consecutive_detections = 0
+                    self.push_doa(voice_info)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                error = str(e)
+
+            if error is None:
+                failures = 0
+
+                # Match the polling rate to how often the sensor actually updates. Only
+                # the number of polls between new readings is informative: a sensor that
+                # changes on every poll may be any amount faster, so that case can only
+                # bring the interval back down to the tracking interval, never below it.
+                polls_since_change += 1
+                if voice_info != last_info:
+                    now = self._now()
+                    if last_change is not None:
+                        if polls_since_change == 1:
+                            paced = max(self._tracking_interval, paced / POLL_SPEEDUP)
+                        elif polls_since_change <= STALE_POLLS_BEFORE_BACKOFF + 1:
+                            # A few unchanged polls in between: the sensor is slower than this
+                            paced = min(
+                                MAX_STALE_POLL_INTERVAL,
+                                max(self._tracking_interval, POLL_RATE_FACTOR * (now - last_change))
+                            )
+                        # A longer run was a silence and says nothing about the sensor
+                    interval = paced
+                    last_info = voice_info
+                    last_change = now
+                    polls_since_change = 0
+                elif polls_since_change > STALE_POLLS_BEFORE_BACKOFF:
+                    interval = min(MAX_STALE_POLL_INTERVAL, interval * 2)
+
+                await asyncio.sleep(interval)
+                continue
+
+            # Back off while the sensor is unavailable instead of retrying at full rate
+            failures = min(failures + 1, MAX_POLL_FAILURES)
+            if failures == 1:
+                logger.warning("[VoiceTracking] DoA polling failed, backing off: %s", error)
+            await asyncio.sleep(min(MAX_POLL_BACKOFF, self._tracking_interval * 2 ** failures))
 
-                await asyncio.sleep(self._tracking_interval)
+    async def _tracking_loop(self):
+        """Main tracking loop that reacts to each new voice direction sample."""
+        robot = self._get_robot_service()
+        consecutive_detections = 0
+
+        while self._tracking_enabled:
+            try:
+                # Wait for the next DoA sample instead of polling on a timer
+                await self._doa_ready.wait()
+                self._doa_ready.clear()
+                voice_info = self._latest_voice_info
+                if not voice_info:
+                    continue
+
+                # Read each field once into locals for the rest of the iteration
+                get = voice_info.get
+                doa = get("direction_of_arrival")
+                if doa is None:
+                    continue
+                speech_detected = get("speech_detected", False)
+
+                # In continuous mode, always track the direction
+                # In speech mode, only track when speech is detected
+                if not (self._continuous_mode or speech_detected):
+                    consecutive_detections = 0
+                    continue
+
+                doa_degrees = self._to_degrees(doa)
+
+                # A running median drops one-off multipath glitches before they reach the EMA.
+                # It is taken over offsets from the newest sample so bearings either side of
+                # ±180° don't average out to the opposite direction.
+                self._doa_window.append(doa_degrees)
+                offset = statistics.median([self._angdiff(d, doa_degrees) for d in self._doa_window])
+                doa_degrees = self._angdiff(doa_degrees + offset, 0.0)
+
+                # Check if movement is significant enough
+                last_doa = self._last_doa
+                if last_doa is not None:
+                    delta = self._angdiff(doa_degrees, last_doa)
+                    threshold = self._params.min_movement_threshold
+                    if delta * delta <= threshold * threshold:
+                        # The filtered direction held steady through this sample
+                        self._last_doa_time = self._now()
+                        continue
+
+                result = await self.look_at_speaker(doa_degrees, robot=robot)
+
+                if not speech_detected:
+                    continue
+                consecutive_detections += 1
+                now = self._now()
+                if now - self._last_callback_time < self._callback_min_interval:
+                    continue
+                self._last_callback_time = now
+
+                # Reuse the angle the head was sent to rather than converting again
+                head_angle = result.get("head_angle")
+                if head_angle is None:
+                    head_angle = self.doa_to_head_angle(doa_degrees)
+                # Don't let slow subscribers hold up the next sample
+                task = self._task_group.create_task(self._notify_callbacks({
+                    "event": "speech_detected",
+                    "doa": doa_degrees,
+                    "head_angle": head_angle,
+                    "consecutive": consecutive_detections
+                }))
+                self._callback_tasks.add(task)
+                task.add_done_callback(self._callback_tasks.discard)
 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 await asyncio.sleep(self._tracking_interval)
 
+    async def _supervise_tracking(self):
+        """Run the DoA poller and tracking loop as one unit until cancelled."""
+        try:
+            async with asyncio.TaskGroup() as tg:
+                self._task_group = tg
+                tg.create_task(self._poll_doa())
+                tg.create_task(self._tracking_loop())
+        finally:
+            self._task_group = None
+
     async def start_tracking(self) -> dict:
         """Start voice tracking - robot will follow speaker's voice."""
         if self._tracking_enabled:
@@ -175,8 +419,13 @@ class VoiceTrackingService:
         # Start audio recording for voice detection
         await robot.start_recording()
 
+        # Pick the DoA unit conversion once instead of guessing from each sample's magnitude
+        self._to_degrees = math.degrees if getattr(robot, "doa_unit", "rad") == "rad" else float
+
         self._tracking_enabled = True
-        self._tracking_task = asyncio.create_task(self._tracking_loop())
+        self._now = asyncio.get_running_loop().time
+        self._doa_ready.clear()
+        self._tracking_task = asyncio.create_task(self._supervise_tracking())
 
         return {"success": True, "message": "Voice tracking started - robot will follow speaker"}
 
@@ -187,13 +436,21 @@ class VoiceTrackingService:
 
         self._tracking_enabled = False
 
-        if self._tracking_task:
-            self._tracking_task.cancel()
+        # Let notifications already under way reach their subscribers
+        if self._callback_tasks:
+            await asyncio.gather(*self._callback_tasks, return_exceptions=True)
+
+        # Cancelling the supervisor tears down everything in its task group
+        task, self._tracking_task = self._tracking_task, None
+        if task:
+            task.cancel()
             try:
-                await self._tracking_task
+                await task
             except asyncio.CancelledError:
                 pass
-            self._tracking_task = None
+        self._latest_voice_info = None
+
+        await self._cancel_pending_move()
 
         robot = self._get_robot_service()
         await robot.stop_recording()
@@ -202,6 +459,11 @@ class VoiceTrackingService:
         await robot.look_at_user()
 
         self._last_doa = None
+        self._last_doa_time = None
+        self._last_head_angle = None
+        self._doa_window.clear()
+        self._last_callback_time = 0.0
+        self._now = None
 
         return {"success": True, "message": "Voice tracking stopped"}
 
@@ -214,17 +476,17 @@ class VoiceTrackingService:
         return {
             "tracking_enabled": self._tracking_enabled,
             "last_doa": self._last_doa,
-            "smoothing_factor": self._smoothing_factor,
-            "min_movement_threshold": self._min_movement_threshold
+            "smoothing_factor": self._params.smoothing_factor,
+            "min_movement_threshold": self._params.min_movement_threshold
         }
 
     def set_smoothing(self, factor: float):
         """Set smoothing factor (0.0 = no smoothing, 1.0 = instant)."""
-        self._smoothing_factor = max(0.0, min(1.0, factor))
+        self._params = replace(self._params, smoothing_factor=max(0.0, min(1.0, factor)))
 
     def set_movement_threshold(self, degrees: float):
         """Set minimum movement threshold in degrees."""
-        self._min_movement_threshold = max(1.0, degrees)
+        self._params = replace(self._params, min_movement_threshold=max(1.0, degrees))
 
 
 # Singleton instance
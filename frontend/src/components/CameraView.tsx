@@ -10,16 +10,14 @@ interface CaptureResult {
   format?: string;
 }
 
-interface StreamFrame {
-  image_base64?: string;
-  format?: string;
-  width?: number;
-  height?: number;
-  fps?: number;
+interface StreamMessage {
   keepalive?: boolean;
   error?: string;
 }
 
+// Binary frames: width, height (uint16) and fps (float32), little-endian, then the JPEG
+const FRAME_HEADER_SIZE = 8;
+
 export function CameraView() {
   const [currentFrame, setCurrentFrame] = useState<string | null>(null);
   const [capturedImage, setCapturedImage] = useState<CaptureResult | null>(null);
@@ -30,6 +28,7 @@ export function CameraView() {
   const [resolution, setResolution] = useState<string>('');
   const wsRef = useRef<WebSocket | null>(null);
   const reconnectTimeoutRef = useRef<number | null>(null);
+  const frameUrlRef = useRef<string | null>(null);
 
   // Cleanup on unmount
   useEffect(() => {
@@ -40,6 +39,9 @@ export function CameraView() {
       if (wsRef.current) {
         wsRef.current.close();
       }
+      if (frameUrlRef.current) {
+        URL.revokeObjectURL(frameUrlRef.current);
+      }
     };
   }, []);
 
@@ -50,6 +52,7 @@ export function CameraView() {
 
     console.log('Connecting to video stream:', `${WS_BASE}/api/robot/video-stream/ws`);
     const ws = new WebSocket(`${WS_BASE}/api/robot/video-stream/ws`);
+    ws.binaryType = 'arraybuffer';
     wsRef.current = ws;
 
     ws.onopen = () => {
@@ -60,7 +63,29 @@ export function CameraView() {
 
     ws.onmessage = (event) => {
       try {
-        const data: StreamFrame = JSON.parse(event.data);
+        if (event.data instanceof ArrayBuffer) {
+          const header = new DataView(event.data, 0, FRAME_HEADER_SIZE);
+          const width = header.getUint16(0, true);
+          const height = header.getUint16(2, true);
+          const frameFps = header.getFloat32(4, true);
+
+          // View the JPEG in place rather than copying it out of the message buffer
+          const jpeg = new Uint8Array(event.data, FRAME_HEADER_SIZE);
+          const blob = new Blob([jpeg], { type: 'image/jpeg' });
+          const url = URL.createObjectURL(blob);
+          if (frameUrlRef.current) {
+            URL.revokeObjectURL(frameUrlRef.current);
+          }
+          frameUrlRef.current = url;
+
+          setCurrentFrame(url);
+          setError(null);
+          setFps(Math.round(frameFps * 10) / 10);
+          setResolution(`${width}×${height}`);
+          return;
+        }
+
+        const data: StreamMessage = JSON.parse(event.data);
 
         if (data.keepalive) {
           return;
@@ -69,20 +94,6 @@ export function CameraView() {
         if (data.error) {
           setError(data.error);
           setFps(0);
-          return;
-        }
-
-        if (data.image_base64) {
-          setCurrentFrame(`data:image/${data.format || 'jpeg'};base64,${data.image_base64}`);
-          setError(null);
-
-          if (data.fps !== undefined) {
-            setFps(data.fps);
-          }
-
-          if (data.width && data.height) {
-            setResolution(`${data.width}×${data.height}`);
-          }
         }
       } catch (e) {
         console.error('Failed to parse frame:', e);